@@ -1,3 +1,4 @@
+import functools
 import yaml
 import re
 from pathlib import Path
@@ -7,6 +8,10 @@ def load_language_settings(yaml_file="LANG_SETTINGS.yml"):
     """
     Loads language-specific settings from a YAML file and compiles regex patterns.
 
+    The parsed settings are cached per resolved file path, so repeated calls
+    (e.g., one per language, or from worker processes) reuse the same parse
+    and compiled patterns instead of re-reading the file.
+
     Args:
         yaml_file (str, optional): Path to the YAML file containing language settings.
             Defaults to "LANG_SETTINGS.yml".
@@ -24,11 +29,17 @@ def load_language_settings(yaml_file="LANG_SETTINGS.yml"):
                   ...
               }
     """
-    # convert to a Path object for cross-platform compatibility
-    yaml_file = Path(yaml_file).resolve()
+    # resolve so that different spellings of the same path share a cache entry
+    return _load_language_settings_cached(str(Path(yaml_file).resolve()))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_language_settings_cached(yaml_file):
+    yaml_file = Path(yaml_file)
 
     with yaml_file.open("r", encoding="utf-8") as file:
-        language_settings = yaml.safe_load(file)
+        # the C-accelerated safe loader when libyaml is available
+        language_settings = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     # compile regex patterns for section headers in each language
     for lang, settings in language_settings.items():
@@ -1,11 +1,152 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Union
+import os
 import re
-import gzip
-import pickle
+import shutil
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
-from utils import extract_wikilinks, resolve_redirects, fix_dubious_links
+from utils import fix_dubious_links_series
+
+
+# regex pattern to extract wikilinks of all types, compiled once at import so
+# every batch (and every worker process) reuses the same pattern object
+WIKI_LINK_REGEX = re.compile(
+    r"\[\["
+    r"([^\|\[\]#]+)"
+    r"(?:\|[^\]]+)?"
+    r"\]\]"
+)
+
+# links to other language wikis, e.g. "fr:Page" or "nds:Page"
+LANG_LINK_REGEX = re.compile(r"^[a-zA-Z]{2,3}:")
+
+
+def _normalise_links(column: pd.Series, capitalize: bool = False) -> np.ndarray:
+    """
+    Normalizes a column of page titles with Arrow compute kernels.
+
+    Replaces underscores with spaces and, if `capitalize` is set, uppercases
+    the first character (Wikipedia titles are case-sensitive except for the
+    leading character). Runs entirely on the Arrow UTF-8 buffer instead of
+    calling a Python function per row; missing values pass through as nulls.
+    """
+    arr = pa.Array.from_pandas(column, type=pa.string())
+    arr = pc.replace_substring(arr, pattern="_", replacement=" ")
+    if capitalize:
+        arr = pc.binary_join_element_wise(
+            pc.utf8_upper(pc.utf8_slice_codeunits(arr, 0, 1)),
+            pc.utf8_slice_codeunits(arr, 1),
+            "")
+    return arr.to_numpy(zero_copy_only=False)
+
+
+def _extract_edges(batch, filter_re_str, redirect_keywords) -> pd.DataFrame:
+    """
+    Cleans one Arrow batch of (title, text) pages and returns its edge list.
+
+    Filters out unwanted titles, flags redirects, extracts and normalizes the
+    wikilinks, and drops NaN targets, interlanguage links and self-loops.
+    The returned frame has Source/Target/Redirect_Flag columns and may be
+    empty if every page of the batch was filtered out.
+    """
+    # Remove pages whose titles match filter-out patterns BEFORE exploding.
+    # The mask is computed with an Arrow compute kernel while the batch is
+    # still in columnar form, so the scan runs over the contiguous UTF-8
+    # buffer instead of a per-row Python loop.
+    keep_mask = pc.invert(pc.match_substring_regex(
+        batch.column("title"), filter_re_str, ignore_case=True))
+    batch = batch.filter(keep_mask)
+
+    # detect the lines that are redirects and add a binary flag;
+    # utf8_lower/starts_with run over the contiguous Arrow UTF-8 buffer
+    # instead of allocating a lowered Python string per article
+    text_lower = pc.utf8_lower(batch.column("text"))
+    redirect_mask = pc.starts_with(text_lower, pattern=redirect_keywords[0])
+    for keyword in redirect_keywords[1:]:
+        redirect_mask = pc.or_(
+            redirect_mask, pc.starts_with(text_lower, pattern=keyword))
+
+    df = batch.to_pandas()
+    df["Redirect_Flag"] = redirect_mask.cast(
+        pa.int64()).to_numpy(zero_copy_only=False)
+    # extract wikilinks from the text and
+    # explode the dataframe so that each row corresponds to a single link
+    df["wikilinks"] = df["text"].str.findall(WIKI_LINK_REGEX)
+
+    # create a new dataframe where each row corresponds to a single link,
+    # with columns for source and target
+    graph_data = (
+        df.explode("wikilinks")
+          .rename(columns={"title": "Source", "wikilinks": "Target"})
+          .drop(columns=["text"], errors="ignore")
+    )
+    # fix dubious links and normalize target titles; capitalization is
+    # applied to targets because Wikipedia page titles are case-sensitive
+    # except for the leading character
+    graph_data["Source"] = _normalise_links(graph_data["Source"])
+    # targets repeat heavily after the explode, so normalize only the unique
+    # titles and gather the results back through the factorized codes; the
+    # appended None catches the -1 codes that factorize assigns to NaN rows
+    target_codes, target_uniques = pd.factorize(graph_data["Target"])
+    normalised_uniques = np.append(
+        _normalise_links(pd.Series(target_uniques), capitalize=True), None)
+    graph_data["Target"] = normalised_uniques[target_codes]
+
+    # the section-link and interlanguage-link checks are also evaluated per
+    # unique title and gathered through the same codes, so the short-pattern
+    # regex runs U times per batch instead of once per link occurrence
+    unique_targets = pd.Series(normalised_uniques[:-1], dtype=object)
+    section_uniques = np.append(
+        unique_targets.str.startswith("#", na=False).to_numpy(), False)
+    lang_link_uniques = np.append(
+        unique_targets.str.match(LANG_LINK_REGEX, na=False).to_numpy(), False)
+
+    # normalize section links to self-links
+    graph_data["Target"] = graph_data["Target"].mask(
+        section_uniques[target_codes], graph_data["Source"])
+
+    # fuse the remaining row filters (NaN targets, links to other
+    # language wikis, self-loops) into a single boolean mask so the
+    # batch is scanned and copied once instead of three times
+    target = graph_data["Target"]
+    keep_mask = (
+        target.notna()
+        & ~lang_link_uniques[target_codes]
+        & (graph_data["Source"] != target)
+    )
+    return graph_data[keep_mask]
+
+
+def _process_row_group(
+    input_file_path: str,
+    row_group_index: int,
+    filter_re_str: str,
+    redirect_keywords: list,
+    spill_path: str,
+):
+    """
+    Worker: reads one Parquet row group, extracts its edges and writes them
+    to its own spill shard. Returns the shard path, or None if the row group
+    produced no edges. Workers read the row group themselves so only file
+    paths and indices cross the process boundary, never page texts.
+    """
+    # pre_buffer coalesces the column-chunk reads and lets Arrow's IO thread
+    # pool overlap the next chunk's read with decompression; only the two
+    # columns the pipeline uses are fetched at all
+    batch = pq.ParquetFile(
+        input_file_path, pre_buffer=True, buffer_size=8 << 20,
+    ).read_row_group(row_group_index, columns=["title", "text"], use_threads=True)
+    graph_data = _extract_edges(batch, filter_re_str, redirect_keywords)
+    if graph_data.empty:
+        return None
+    graph_data.to_parquet(
+        spill_path, engine="pyarrow", index=False,
+        compression="zstd", compression_level=3)
+    return spill_path
 
 
 def generate_graph(
@@ -13,7 +154,8 @@ def generate_graph(
     settings: dict,
     input_file_path: Union[str, Path],
     graph_output_dir: Union[str, Path],
-    use_string_labels: bool = False
+    use_string_labels: bool = False,
+    num_workers: int = None
 ):
     input_file_path = Path(input_file_path)
     graph_output_dir = Path(graph_output_dir)
@@ -22,72 +164,47 @@ def generate_graph(
     # regex patterns needed for filtering out unwanted pages and identifying redirects
     filter_out_patterns = settings["filter_out_patterns"]
     redirect_keywords = [kw.lower() for kw in settings["redirect_keywords"]]
-    filter_re = re.compile("|".join(filter_out_patterns), flags=re.IGNORECASE)
-
-    # regex pattern to extract wikilinks of all types
-    wiki_link_regex = re.compile(
-        r"\[\["
-        r"([^\|\[\]#]+)"
-        r"(?:\|[^\]]+)?"
-        r"\]\]"
-    )
+    filter_re_str = "|".join(filter_out_patterns)
 
-    parquet_file = pq.ParquetFile(input_file_path)
-    all_graph_data = []
-
-    for batch_index, batch in enumerate(parquet_file.iter_batches(batch_size=50_000)):
-        df = batch.to_pandas()
-
-        # Remove pages whose titles match filter-out patterns BEFORE exploding
-        df = df[~df["title"].apply(lambda s: bool(
-            isinstance(s, str) and filter_re.search(s)))]
-
-        # detect the lines that are redirects add a binary flag
-        df["Redirect_Flag"] = df["text"].str.lower().str.startswith(
-            tuple(redirect_keywords)).astype(int)
-        # extract wikilinks from the text and 
-        # explode the dataframe so that each row corresponds to a single link
-        df["wikilinks"] = df["text"].apply(
-            lambda x: extract_wikilinks(wiki_link_regex, x))
-
-        # create a new dataframe where each row corresponds to a single link, 
-        # with columns for source and target
-        graph_data = (
-            df.explode("wikilinks")
-              .rename(columns={"title": "Source", "wikilinks": "Target"})
-              .drop(columns=["text"], errors="ignore")
-        )
-        # fix dubious links and normalize target titles
-        graph_data["Source"] = graph_data["Source"].apply(fix_dubious_links)
-        graph_data["Target"] = graph_data["Target"].apply(fix_dubious_links)
-        # normalization is happening here because Wikipedia page titles are case-sensitive
-        graph_data["Target"] = graph_data["Target"].apply(
-            lambda word: word[0].upper(
-            ) + word[1:] if isinstance(word, str) and word else word
-        )
-        # drop NaN values in the Target column
-        # very few instance but they can exist
-        graph_data = graph_data.dropna(subset=["Target"])
-
-        # normalize section links to self-links
-        bool_mask = graph_data["Target"].str.startswith("#")
-        graph_data.loc[bool_mask,
-                       "Target"] = graph_data.loc[bool_mask, "Source"]
-
-        # remove links to other language wikis
-        lang_link_pattern = r"^[a-zA-Z]{2,3}:"
-        graph_data = graph_data[~graph_data["Target"].str.match(
-            lang_link_pattern)]
-
-        # remove self-loops
-        graph_data = graph_data[graph_data["Source"] != graph_data["Target"]]
-
-        all_graph_data.append(graph_data)
-
-    final_graph_data = pd.concat(all_graph_data, ignore_index=True)
-    # resolve redirects in the target column and 
-    # remove any resulting self-loops or duplicates
-    redirect_mapping_path = graph_output_dir / "redirects_rev_mapping.pkl.gzip"
+    # the parser writes either a single Parquet file or a dataset directory
+    # of part files; every (part, row group) pair becomes one work unit
+    if input_file_path.is_dir():
+        part_files = sorted(input_file_path.glob("*.parquet"))
+    else:
+        part_files = [input_file_path]
+
+    # each worker cleans whole row groups and spills the resulting edges to
+    # its own Parquet shard; only paths and indices are pickled across the
+    # process boundary, and peak memory stays at one row group per worker
+    spill_dir = graph_output_dir / f"{language_code}_edges_spill"
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    worker_args = []
+    for part_file in part_files:
+        for index in range(pq.ParquetFile(part_file).num_row_groups):
+            worker_args.append(
+                (str(part_file), index, filter_re_str, redirect_keywords,
+                 str(spill_dir / f"edges-{len(worker_args):05d}.parquet")))
+    num_workers = min(num_workers or os.cpu_count() or 1, max(len(worker_args), 1))
+    if num_workers > 1:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            spill_paths = list(executor.map(
+                _process_row_group, *zip(*worker_args)))
+    else:
+        spill_paths = [_process_row_group(*args) for args in worker_args]
+    spill_paths = [path for path in spill_paths if path is not None]
+
+    if not spill_paths:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        raise ValueError(
+            f"No graph edges were extracted from {input_file_path}.")
+    final_graph_data = pq.ParquetDataset(spill_paths).read().to_pandas()
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    # resolve redirects in the target column and
+    # remove any resulting self-loops or duplicates.
+    # The mapping is persisted as a two-column Arrow IPC file: reloading is a
+    # memory-map plus two column reads instead of a gzip decompress and a
+    # pickle unmarshal of the whole dict.
+    redirect_mapping_path = graph_output_dir / "redirects_rev_mapping.arrow"
     if not redirect_mapping_path.exists():
         reverse_redirect_dict = dict(zip(
             final_graph_data.loc[final_graph_data["Redirect_Flag"]
@@ -97,53 +214,98 @@ def generate_graph(
         ))
         reverse_redirect_dict = {k: v for k,
                                  v in reverse_redirect_dict.items() if k != v}
-        with gzip.open(redirect_mapping_path, "wb") as outp:
-            pickle.dump(reverse_redirect_dict, outp,
-                        protocol=pickle.HIGHEST_PROTOCOL)
+        mapping_table = pa.table({
+            "redirect": pa.array(reverse_redirect_dict.keys(), type=pa.string()),
+            "target": pa.array(reverse_redirect_dict.values(), type=pa.string()),
+        })
+        with pa.OSFile(str(redirect_mapping_path), "wb") as sink:
+            with pa.ipc.new_file(sink, mapping_table.schema) as ipc_writer:
+                ipc_writer.write_table(mapping_table)
     else:
-        with gzip.open(redirect_mapping_path, "rb") as inp:
-            reverse_redirect_dict = pickle.load(inp)
-
-    normalised_rev_red_dict = {
-        fix_dubious_links(k): fix_dubious_links(v)
-        for k, v in reverse_redirect_dict.items()
-    }
-
-    final_graph_data["Target"] = resolve_redirects(
-        final_graph_data["Target"], normalised_rev_red_dict)
-    final_graph_data = final_graph_data[final_graph_data["Source"]
-                                        != final_graph_data["Target"]]
-
-    final_graph_data = final_graph_data.drop_duplicates(
-        subset=["Source", "Target"], keep="first")
-    final_graph_data = final_graph_data[final_graph_data["Redirect_Flag"] != 1].drop(
-        "Redirect_Flag", axis=1, errors="ignore")
+        with pa.memory_map(str(redirect_mapping_path), "r") as source:
+            mapping_table = pa.ipc.open_file(source).read_all()
+        reverse_redirect_dict = dict(zip(
+            mapping_table.column("redirect").to_pylist(),
+            mapping_table.column("target").to_pylist()
+        ))
+
+    # normalize redirect sources and targets in two vectorized passes
+    # rather than two Python calls per redirect entry
+    normalised_rev_red_dict = dict(zip(
+        fix_dubious_links_series(pd.Series(list(reverse_redirect_dict.keys()), dtype=object)),
+        fix_dubious_links_series(pd.Series(list(reverse_redirect_dict.values()), dtype=object)),
+    ))
+
+    # resolve redirects on the unique targets only: factorize the column,
+    # look each unique title up in the dict once, and gather the resolved
+    # values back through the integer codes. Link targets repeat heavily, so
+    # this does U dict probes plus one C-level gather instead of N probes.
+    target_codes, target_uniques = pd.factorize(final_graph_data["Target"])
+    resolved_uniques = np.array(
+        [normalised_rev_red_dict.get(title, title) for title in target_uniques],
+        dtype=object)
+    final_graph_data["Target"] = resolved_uniques[target_codes]
 
-    set_sources = set(final_graph_data["Source"])
-    final_graph_data = final_graph_data[final_graph_data["Target"].isin(
-        set_sources)]
-    final_graph_data = final_graph_data.dropna(subset=["Source", "Target"])
+    # deduplicate edges on packed integer keys: factorize each endpoint column
+    # and combine the two codes into a single uint64, which np.unique can
+    # dedup (keeping the first occurrence) without hashing Python strings
+    src_codes, _ = pd.factorize(final_graph_data["Source"])
+    tgt_codes, _ = pd.factorize(final_graph_data["Target"])
+    edge_keys = (src_codes.astype(np.uint64) << np.uint64(32)) \
+        | tgt_codes.astype(np.uint64)
+    _, first_indices = np.unique(edge_keys, return_index=True)
+    final_graph_data = final_graph_data.iloc[np.sort(first_indices)]
 
+    # fuse the remaining full-frame filters (self-loops created by redirect
+    # resolution, redirect rows themselves, residual missing endpoints) into
+    # a single boolean pass instead of three materializing scans
+    source = final_graph_data["Source"]
+    target = final_graph_data["Target"]
+    keep_mask = (
+        (source != target)
+        & (final_graph_data["Redirect_Flag"] != 1)
+        & source.notna()
+        & target.notna()
+    )
+    final_graph_data = final_graph_data[keep_mask].drop(
+        "Redirect_Flag", axis=1, errors="ignore")
+
+    # keep only edges whose target also appears as a source. Factorizing the
+    # two columns into integer codes turns the membership test into a boolean
+    # bitmap load per row instead of a Python hash-set probe per string.
     combined = pd.concat(
         [final_graph_data["Source"], final_graph_data["Target"]], ignore_index=True)
-    labels, uniques = pd.factorize(combined)
+    codes, uniques = pd.factorize(combined)
+    n_edges = len(final_graph_data)
+    source_bitmap = np.zeros(len(uniques), dtype=bool)
+    source_bitmap[codes[:n_edges]] = True
+    edge_mask = source_bitmap[codes[n_edges:]]
+    final_graph_data = final_graph_data[edge_mask]
+
+    # assign the numeric node ids by compacting the codes of the surviving
+    # edges; this reuses the factorization above instead of re-hashing every
+    # endpoint string a second time
+    kept_codes = np.concatenate(
+        [codes[:n_edges][edge_mask], codes[n_edges:][edge_mask]])
+    kept_uniques, labels = np.unique(kept_codes, return_inverse=True)
     assert len(labels) == 2 * \
         len(final_graph_data), "Mismatch between factorized labels and graph size."
     final_graph_data["Source"] = labels[:len(final_graph_data)]
     final_graph_data["Target"] = labels[len(final_graph_data):]
 
-    mapping_df = pd.DataFrame({"id": range(len(uniques)), "label": uniques})
+    mapping_df = pd.DataFrame(
+        {"id": range(len(kept_uniques)), "label": uniques.take(kept_uniques)})
     mapping_df_path = graph_output_dir / \
         f"{language_code}_id_node_mapping.parquet"
     mapping_df.to_parquet(
-        mapping_df_path, engine="pyarrow", 
-        compression="gzip", 
-        compression_level=5)
+        mapping_df_path, engine="pyarrow",
+        compression="zstd",
+        compression_level=3)
 
     graph_output_path = graph_output_dir / \
         f"{language_code}_wiki_graph.parquet"
     final_graph_data.to_parquet(
-        graph_output_path, engine="pyarrow", 
-        compression="gzip", 
-        compression_level=5)
+        graph_output_path, engine="pyarrow",
+        compression="zstd",
+        compression_level=3)
     print(f"Graph data saved to {graph_output_path}")
\ No newline at end of file
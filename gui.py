@@ -1,8 +1,84 @@
-import tkinter as tk
-from tkinter import filedialog, Frame, Label, Button, Radiobutton, OptionMenu, StringVar, BooleanVar, PhotoImage
+import base64
 import os
+import threading
 from pathlib import Path
-import webbrowser  # For opening links
+from queue import Empty, Queue
+
+# window chrome and palette, shared by every widget build below
+_WINDOW_TITLE = "WikiTextGraph"
+_WINDOW_GEOMETRY = "550x750"  # ensure everything fits without resizing
+_LOGO_PATH = "logo/mestizajes_logo-removebg-preview.png"
+
+# supported language codes, pre-sorted so the dropdown can use them as-is
+_AVAILABLE_LANGUAGES = ("de", "el", "en", "es", "eu", "hi", "it", "nl", "pl", "uk", "vi")
+
+# revert to the previous color scheme that worked on macOS
+# cross-platform safe color scheme
+_SYSTEM_BG = "white"  # safe, neutral background
+_TEXT_COLOR = "black"  # high contrast text
+_HIGHLIGHT_COLOR = "blue"  # standard heading highlight
+_BUTTON_COLOR_START = "lightgray"  # replaces SystemButtonFace
+_BUTTON_COLOR_GITHUB = "lightgray"
+_BUTTON_COLOR_CONTACT = "lightgray"
+_BUTTON_TEXT_COLOR = "black"
+
+# decoded logo images, keyed on (path, subsample); PNG decode is paid once
+# per process instead of once per gui_prompt_for_inputs call
+_LOGO_CACHE = {}
+
+
+def _get_logo(photo_image_cls, path, subsample=None):
+    """
+    Returns a (possibly cached) PhotoImage for the given path, or None if the
+    file does not exist. `photo_image_cls` is passed in because tkinter is
+    imported lazily by the caller.
+    """
+    key = (path, subsample)
+    img = _LOGO_CACHE.get(key)
+    if img is not None:
+        try:
+            img.width()  # probe: cached images die with their Tk interpreter
+            return img
+        except Exception:
+            del _LOGO_CACHE[key]
+            img = None
+    if os.path.exists(path):
+        img = photo_image_cls(file=path)
+        if subsample:
+            img = img.subsample(*subsample)
+        _LOGO_CACHE[key] = img
+    return img
+
+
+# start-up work done ahead of time by the prewarm thread: the tkinter
+# import (which loads the Tcl/Tk shared libraries) and the logo bytes
+_PREWARM_THREAD = None
+_LOGO_BYTES = None
+
+
+def _prewarm():
+    """
+    Warms the thread-safe part of the GUI start-up while the rest of the
+    program is still importing: pre-imports tkinter (loading the Tcl/Tk
+    shared libraries once) and reads the logo bytes from disk. No Tcl
+    interpreter is created here — Tk objects are bound to the thread that
+    made them, so the root itself must be created on the main thread in
+    gui_prompt_for_inputs. Silently does nothing if either step fails.
+    """
+    global _LOGO_BYTES
+    try:
+        import tkinter  # noqa: F401  (side effect: Tcl/Tk libraries load)
+        if os.path.exists(_LOGO_PATH):
+            _LOGO_BYTES = Path(_LOGO_PATH).read_bytes()
+    except Exception:
+        pass
+
+
+def _start_prewarm():
+    global _PREWARM_THREAD
+    _PREWARM_THREAD = threading.Thread(target=_prewarm, daemon=True)
+    _PREWARM_THREAD.start()
+
 
 def gui_prompt_for_inputs():
     """
@@ -17,60 +93,141 @@ def gui_prompt_for_inputs():
         A tuple containing the file path of the Wikipedia dump, the selected language,
         the output directory, a boolean to indicate whether to generate a graph,
     """
+    # tkinter is imported lazily so that CLI runs (which never open the GUI)
+    # do not pay the Tcl/Tk interpreter start-up cost at import time
+    import tkinter as tk
+    from tkinter import (
+        filedialog, ttk, Frame, Label, Button, Radiobutton,
+        StringVar, BooleanVar, PhotoImage
+    )
+
+    # wait for the prewarm thread (tkinter import + logo bytes) and create
+    # the root here: Tcl interpreters must live on the thread that uses them
+    if _PREWARM_THREAD is not None:
+        _PREWARM_THREAD.join()
     root = tk.Tk()
-    root.title("WikiTextGraph")
-    root.geometry("550x750")  # ensure everything fits without resizing
-
-    # revert to the previous color scheme that worked on macOS
-    # cross-platform safe color scheme
-    system_bg = "white" # safe, neutral background
-    text_color = "black" # high contrast text
-    highlight_color = "blue" # standard heading highlight
-    button_color_start = "lightgray" # replaces SystemButtonFace
-    button_color_github = "lightgray"
-    button_color_contact = "lightgray"
-    button_text_color = "black"
+    root.title(_WINDOW_TITLE)
+    root.geometry(_WINDOW_GEOMETRY)
+
+    system_bg = _SYSTEM_BG
+    text_color = _TEXT_COLOR
+    highlight_color = _HIGHLIGHT_COLOR
+    button_color_start = _BUTTON_COLOR_START
+    button_color_github = _BUTTON_COLOR_GITHUB
+    button_color_contact = _BUTTON_COLOR_CONTACT
+    button_text_color = _BUTTON_TEXT_COLOR
 
     root.configure(bg=system_bg)
     root.columnconfigure(0, weight=1)  # allow column expansion
+
+    # resolve each font spec once: named Font objects hit Tk's font cache,
+    # so widget creation skips the family-resolution walk per widget
+    from tkinter import font as tkfont
+    f_title = tkfont.Font(root=root, family="Arial", size=18, weight="bold")
+    f_step = tkfont.Font(root=root, family="Arial", size=12, weight="bold")
+    f_body = tkfont.Font(root=root, family="Arial", size=12)
+    f_small = tkfont.Font(root=root, family="Arial", size=10, slant="italic")
+
+    # shared widget styles: the option set is parsed by Tcl once per style
+    # instead of once per widget construction
+    style = ttk.Style(root)
+    style.configure("Title.TLabel", background=system_bg, foreground=highlight_color, font=f_title)
+    style.configure("Sub.TLabel", background=system_bg, foreground=text_color, font=f_body)
+    style.configure("Step.TLabel", background=system_bg, foreground=highlight_color, font=f_step)
+    style.configure("Body.TLabel", background=system_bg, foreground=text_color)
+    style.configure("Small.TLabel", background=system_bg, foreground=text_color, font=f_small)
+    style.configure("Accent.TButton", background=button_color_start, foreground=button_text_color)
     
+    user_aborted = False
+    error_label = None  # created with the bottom widgets in build_rest
+
     def on_start():
         """
         Callback for the "Start Processing" button. Validates user inputs and
         closes the GUI if everything is set.
         """
         nonlocal dump_filepath, base_dir  # ensure modifications persist outside function
-        
+
         if not dump_filepath or not base_dir:
-            tk.messagebox.showwarning("Missing Input", "Please select both a dump file and an output directory before proceeding.")
+            # non-modal feedback: a bell plus an inline message instead of a
+            # modal dialog the user has to dismiss
+            if error_label is not None:
+                error_label.config(text="Please select both a dump file and an output directory before proceeding.")
+            root.bell()
             return  # prevent closing if inputs are missing
 
         # quit the main loop and destroy the GUI
         root.quit()
         root.destroy()
 
+    def on_close():
+        """
+        Callback for the window-manager close button. Records the abort so the
+        caller gets an explicit empty result instead of half-filled inputs.
+        """
+        nonlocal user_aborted
+        user_aborted = True
+        root.quit()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
 
     # title
-    title_label = Label(root, text="WikiTextGraph", font=("Arial", 18, "bold"), bg=system_bg, fg=highlight_color)
+    title_label = ttk.Label(root, text="WikiTextGraph", style="Title.TLabel", anchor="center")
     title_label.grid(row=0, column=0, pady=(10, 5), sticky="ew")
 
-    subtitle_label = Label(root, text="Wikipedia XML Dump Processing Tool", font=("Arial", 12), bg=system_bg, fg=text_color)
+    subtitle_label = ttk.Label(root, text="Wikipedia XML Dump Processing Tool", style="Sub.TLabel", anchor="center")
     subtitle_label.grid(row=1, column=0, pady=(0, 5), sticky="ew")
 
-    # load Logo
-    try:
-        logo_path = "logo/mestizajes_logo-removebg-preview.png"
-        if os.path.exists(logo_path):
-            logo_img = PhotoImage(file=logo_path).subsample(3, 3)  # reduce size
-            logo_label = Label(root, image=logo_img, bg=system_bg)
-            logo_label.grid(row=2, column=0, pady=(0, 2), sticky="n")
-            logo_label.image = logo_img  # keep reference
-
-            # funding acknowledgment text
-            funding_label = Label(root, text="Funded by Mestizajes", font=("Arial", 10, "italic"), bg=system_bg, fg=text_color)
-            funding_label.grid(row=3, column=0, pady=(0, 10), sticky="n")
-    except Exception as e:
-        print(f"Error loading logo: {e}")
+    # the PNG is read from disk on a worker thread so the read overlaps with
+    # widget construction; only the decode (which needs the Tk thread) waits.
+    # If the prewarm thread already read the bytes, hand them over directly
+    logo_queue = Queue(maxsize=1)
+    if _LOGO_CACHE.get((_LOGO_PATH, (3, 3))) is None:
+        if _LOGO_BYTES is not None:
+            logo_queue.put(_LOGO_BYTES)
+        else:
+            threading.Thread(
+                target=lambda: logo_queue.put(
+                    Path(_LOGO_PATH).read_bytes() if os.path.exists(_LOGO_PATH) else None
+                ),
+                daemon=True,
+            ).start()
+
+    def build_logo():
+        """
+        Places the logo once its bytes have arrived from the reader thread,
+        polling every 50 ms until then. Decode + subsample happen here on the
+        Tk thread; the cached image is reused on repeated invocations.
+        """
+        try:
+            logo_img = _LOGO_CACHE.get((_LOGO_PATH, (3, 3)))
+            if logo_img is not None:
+                try:
+                    logo_img.width()  # cached images die with their interpreter
+                except Exception:
+                    logo_img = _get_logo(PhotoImage, _LOGO_PATH, subsample=(3, 3))
+            else:
+                try:
+                    data = logo_queue.get_nowait()
+                except Empty:
+                    root.after(50, build_logo)
+                    return
+                if data is None:
+                    return
+                logo_img = PhotoImage(data=base64.b64encode(data)).subsample(3, 3)  # reduce size
+                _LOGO_CACHE[(_LOGO_PATH, (3, 3))] = logo_img
+            if logo_img is not None:
+                logo_label = Label(root, image=logo_img, bg=system_bg)
+                logo_label.grid(row=2, column=0, pady=(0, 2), sticky="n")
+                logo_label.image = logo_img  # keep reference
+
+                # funding acknowledgment text
+                funding_label = ttk.Label(root, text="Funded by Mestizajes", style="Small.TLabel", anchor="center")
+                funding_label.grid(row=3, column=0, pady=(0, 10), sticky="n")
+        except Exception as e:
+            print(f"Error loading logo: {e}")
 
     main_frame = Frame(root, bg=system_bg)
     main_frame.grid(row=4, column=0, padx=40, pady=10, sticky="nsew")
@@ -81,7 +238,7 @@ def gui_prompt_for_inputs():
     base_dir = None
 
     # step 1: Select Dump File
-    step1_label = Label(main_frame, text="Step 1: Select Compressed XML Dump File", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
+    step1_label = ttk.Label(main_frame, text="Step 1: Select Compressed XML Dump File", style="Step.TLabel", anchor="w")
     step1_label.grid(row=0, column=0, sticky="w", pady=(10, 5))
 
     def select_dump_file():
@@ -95,85 +252,113 @@ def gui_prompt_for_inputs():
             dump_filepath = Path(selected_file)
             dump_file_label.config(text=f"Selected: {dump_filepath.name}")
 
-    dump_button = Button(main_frame, text="Browse...", command=select_dump_file, bg=button_color_start, fg=button_text_color, width=15)
+    dump_button = ttk.Button(main_frame, text="Browse...", command=select_dump_file, style="Accent.TButton", width=15)
     dump_button.grid(row=1, column=0, sticky="w", pady=(0, 5))
 
-    dump_file_label = Label(main_frame, text="No file selected", bg=system_bg, fg=text_color)
+    dump_file_label = ttk.Label(main_frame, text="No file selected", style="Body.TLabel")
     dump_file_label.grid(row=2, column=0, sticky="w", pady=(0, 10))
 
-    # step 2: Select Language
-    step2_label = Label(main_frame, text="Step 2: Select Language", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
-    step2_label.grid(row=3, column=0, sticky="w", pady=(10, 5))
+    def build_rest():
+        """
+        Builds Steps 2-4 and the bottom buttons. Scheduled via after_idle so
+        the window paints with Step 1 first and fills in on the next
+        event-loop turn instead of blocking the initial layout.
+        """
+        # step 2: Select Language
+        step2_label = ttk.Label(main_frame, text="Step 2: Select Language", style="Step.TLabel", anchor="w")
+        step2_label.grid(row=3, column=0, sticky="w", pady=(10, 5))
 
-    available_languages = sorted(["en", "es", "el", "pl", "it", "nl", "eu", "hi", "de", "vi", "uk"])
-    selected_language.set(available_languages[0])
+        selected_language.set(_AVAILABLE_LANGUAGES[0])
 
-    dropdown = OptionMenu(main_frame, selected_language, *available_languages)
-    dropdown.grid(row=4, column=0, sticky="w")
+        # a Combobox builds one native widget instead of a Menu entry (plus
+        # variable trace) per language, so Step 2 stays O(1) as the list grows
+        dropdown = ttk.Combobox(main_frame, textvariable=selected_language, values=_AVAILABLE_LANGUAGES, state="readonly", width=5)
+        dropdown.grid(row=4, column=0, sticky="w")
 
-    # step 3: Generate Graph (optional)
-    step3_label = Label(main_frame, text="Step 3: Generate Graph", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
-    step3_label.grid(row=5, column=0, sticky="w", pady=(10, 5))
+        # step 3: Generate Graph (optional)
+        step3_label = ttk.Label(main_frame, text="Step 3: Generate Graph", style="Step.TLabel", anchor="w")
+        step3_label.grid(row=5, column=0, sticky="w", pady=(10, 5))
 
-    yes_radio = Radiobutton(main_frame, text="Yes", variable=generate_graph_flag, value=True, bg=system_bg, fg=text_color)
-    yes_radio.grid(row=6, column=0, padx=(0, 10), sticky="w")
+        yes_radio = Radiobutton(main_frame, text="Yes", variable=generate_graph_flag, value=True, bg=system_bg, fg=text_color)
+        yes_radio.grid(row=6, column=0, padx=(0, 10), sticky="w")
 
-    no_radio = Radiobutton(main_frame, text="No", variable=generate_graph_flag, value=False, bg=system_bg, fg=text_color)
-    no_radio.grid(row=6, column=1, sticky="w")
-    
-    # string2id_label = Label(main_frame, text="Node Label Format", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
-    # string2id_label.grid(row=7, column=0, sticky="w", pady=(10, 5))
+        no_radio = Radiobutton(main_frame, text="No", variable=generate_graph_flag, value=False, bg=system_bg, fg=text_color)
+        no_radio.grid(row=6, column=1, sticky="w")
+        
+        # string2id_label = Label(main_frame, text="Node Label Format", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
+        # string2id_label.grid(row=7, column=0, sticky="w", pady=(10, 5))
 
-    # use_string_labels = BooleanVar(value=False)
-    # label_option = tk.Checkbutton(main_frame,
+        # use_string_labels = BooleanVar(value=False)
+        # label_option = tk.Checkbutton(main_frame,
                                   # text="Keep node labels as strings instead of replacing them with numeric IDs",
                                   # variable=use_string_labels,
                                  #  onvalue=True, offvalue=False,
                                  #  bg=system_bg, fg=text_color)
-    # label_option.grid(row=8, column=0, sticky="w", pady=(0, 10))
+        # label_option.grid(row=8, column=0, sticky="w", pady=(0, 10))
 
-    # step 4: Select Output Folder
-    step4_label = Label(main_frame, text="Step 4: Select Output Directory", font=("Arial", 12, "bold"), bg=system_bg, fg=highlight_color, anchor="w")
-    step4_label.grid(row=7, column=0, sticky="w", pady=(10, 5))
+        # step 4: Select Output Folder
+        step4_label = ttk.Label(main_frame, text="Step 4: Select Output Directory", style="Step.TLabel", anchor="w")
+        step4_label.grid(row=7, column=0, sticky="w", pady=(10, 5))
 
-    def select_output_dir():
-        """
-        Opens a directory dialog for the user to choose a base output directory.
-        """
-        nonlocal base_dir
-        selected_dir = filedialog.askdirectory(title="Select the output directory")
-        if selected_dir:
-            base_dir = Path(selected_dir)
-            dir_label.config(text=f"Selected: {base_dir}")
+        def select_output_dir():
+            """
+            Opens a directory dialog for the user to choose a base output directory.
+            """
+            nonlocal base_dir
+            selected_dir = filedialog.askdirectory(title="Select the output directory")
+            if selected_dir:
+                base_dir = Path(selected_dir)
+                dir_label.config(text=f"Selected: {base_dir}")
+
+        dir_button = ttk.Button(main_frame, text="Browse...", command=select_output_dir, style="Accent.TButton", width=15)
+        dir_button.grid(row=9, column=0, sticky="w", pady=(0, 5))
+
+        dir_label = ttk.Label(main_frame, text="No directory selected", style="Body.TLabel")
+        dir_label.grid(row=10, column=0, sticky="w", pady=(0, 10))
 
-    dir_button = Button(main_frame, text="Browse...", command=select_output_dir, bg=button_color_start, fg=button_text_color, width=15)
-    dir_button.grid(row=9, column=0, sticky="w", pady=(0, 5))
+        # bottom Buttons
+        def open_github():
+            """Open the GitHub repository link in the web browser."""
+            import webbrowser  # deferred: probes the environment on import
+            webbrowser.open("https://github.com/PaschalisAg/WikiTextGraph")
 
-    dir_label = Label(main_frame, text="No directory selected", bg=system_bg, fg=text_color)
-    dir_label.grid(row=10, column=0, sticky="w", pady=(0, 10))
+        def contact_developer():
+            """Open an email client to contact the developer."""
+            import webbrowser  # deferred: probes the environment on import
+            webbrowser.open("mailto:pasxalisag9@gmail.com?subject=WikiTextGraph%20Support")
 
-    # bottom Buttons
-    def open_github():
-        """Open the GitHub repository link in the web browser."""
-        webbrowser.open("https://github.com/PaschalisAg/WikiTextGraph")
+        confirm_button = Button(root, text="Start Processing", font=f_step, bg=button_color_start, fg=button_text_color, width=20, command=on_start)
+        confirm_button.grid(row=11, column=0, pady=10, sticky="ew")
 
-    def contact_developer():
-        """Open an email client to contact the developer."""
-        webbrowser.open("mailto:pasxalisag9@gmail.com?subject=WikiTextGraph%20Support")
+        nonlocal error_label
+        error_label = ttk.Label(root, text="", style="Body.TLabel", anchor="center")
+        error_label.grid(row=13, column=0, sticky="ew")
 
-    confirm_button = Button(root, text="Start Processing", font=("Arial", 12, "bold"), bg=button_color_start, fg=button_text_color, width=20, command=on_start)
-    confirm_button.grid(row=11, column=0, pady=10, sticky="ew")
+        lower_buttons_frame = Frame(root, bg=system_bg)
+        lower_buttons_frame.grid(row=12, column=0, pady=10)
 
-    lower_buttons_frame = Frame(root, bg=system_bg)
-    lower_buttons_frame.grid(row=12, column=0, pady=10)
+        github_button = ttk.Button(lower_buttons_frame, text="GitHub Repo", style="Accent.TButton", width=15, command=open_github)
+        github_button.grid(row=0, column=0, padx=20)
 
-    github_button = Button(lower_buttons_frame, text="GitHub Repo", font=("Arial", 12), bg=button_color_github, fg=button_text_color, width=15, command=open_github)
-    github_button.grid(row=0, column=0, padx=20)
+        contact_button = ttk.Button(lower_buttons_frame, text="Contact Dev", style="Accent.TButton", width=15, command=contact_developer)
+        contact_button.grid(row=0, column=1, padx=20)
 
-    contact_button = Button(lower_buttons_frame, text="Contact Dev", font=("Arial", 12), bg=button_color_contact, fg=button_text_color, width=15, command=contact_developer)
-    contact_button.grid(row=0, column=1, padx=20)
+    # paint the window with Step 1 first; the remaining widgets and the
+    # logo fill in on the next event-loop turns
+    root.after_idle(build_rest)
+    root.after(50, build_logo)
 
     root.mainloop()
-    
+
+    # window closed via the WM: report the abort explicitly (and skip the
+    # variable .get() calls, whose Tcl state is gone with the root)
+    if user_aborted:
+        return None, None, None, None
+
     # return the values so that the algorithm can start running
     return dump_filepath, selected_language.get(), base_dir, generate_graph_flag.get()# , use_string_labels.get()
+
+
+# warm the Tcl interpreter while the rest of the pipeline (pandas, pyarrow,
+# wikitextparser) is still importing on the main thread
+_start_prewarm()
@@ -1,15 +1,54 @@
 import xml.sax
 import gc
 import codecs
-import pandas as pd
+import os
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from queue import Queue
 import pyarrow as pa
 import pyarrow.parquet as pq
 import bz2
-import yaml
-import re
 from pathlib import Path
-from graph import generate_graph
-from utils import extract_wiki_main_text, filter_non_content_pages
+from config import get_language_settings
+from utils import extract_wiki_main_text
+
+
+# schema of the titles/texts Parquet output; fixed up front so every batch
+# writes identically without round-tripping through pandas. Texts use
+# large_string so a batch of long articles cannot overflow the 2 GiB
+# 32-bit offset limit of the plain string type; titles stay plain (they
+# are short, and are dictionary-encoded at write time anyway)
+_BATCH_SCHEMA = pa.schema([("title", pa.string()), ("text", pa.large_string())])
+
+# small-int codes for the two tags we buffer: the SAX callbacks run once per
+# XML element, and an int compare is cheaper than repeated string equality
+_T_TITLE, _T_TEXT = 1, 2
+_TAGS = {"title": _T_TITLE, "text": _T_TEXT}
+
+# rows per Parquet row group: batches are accumulated to this size before
+# writing so filtering does not leave a file full of tiny row groups
+_TARGET_RG_ROWS = 128_000
+
+# rows per Parquet part file: the writer rotates to a new part beyond this,
+# so the graph stage can fan out over files as well as row groups
+_ROWS_PER_FILE = 1_000_000
+
+# compiled section pattern of a cleaning worker process, set by the pool
+# initializer so batches pickle only the text payload
+_WORKER_SECTION_PATT = None
+
+
+def _init_clean_worker(section_patt_src):
+    global _WORKER_SECTION_PATT
+    _WORKER_SECTION_PATT = re.compile(section_patt_src, flags=re.IGNORECASE)
+
+
+def _clean_text_worker(text):
+    return extract_wiki_main_text(text, _WORKER_SECTION_PATT)
 
 
 class WikiXmlHandler(xml.sax.handler.ContentHandler):
@@ -24,7 +63,7 @@ class WikiXmlHandler(xml.sax.handler.ContentHandler):
         redirect_keywords (list): Keywords used to detect redirects.
     """
 
-    def __init__(self, batch_size, output_file, section_patt, filter_out_patterns=None, redirect_keywords=None):
+    def __init__(self, batch_size, output_file, section_patt, filter_out_patterns=None, redirect_keywords=None, max_workers=None):
         """
         Initializes the SAX handler.
 
@@ -34,104 +73,247 @@ class WikiXmlHandler(xml.sax.handler.ContentHandler):
             section_patt (Pattern): Compiled regex pattern for detecting section headers.
             filter_out_patterns (list, optional): Patterns to exclude pages. Defaults to None.
             redirect_keywords (list, optional): Keywords indicating redirects. Defaults to None.
+            max_workers (int, optional): Worker processes for text cleaning.
+                Defaults to the CPU count; pass 1 to clean in-process.
         """
         super().__init__()
-        self._buffer = []
+        # one reusable text buffer: SAX delivers <text> bodies in thousands
+        # of short fragments, and a StringIO grows in place instead of
+        # accumulating a list of fragments to join
+        self._buffer = StringIO()
+        self._buffer_write = self._buffer.write  # bound once for characters()
         self._current_tag = None
-        self._pages = []
+        # preallocated parallel title/text slots filled by index: no
+        # per-page dict allocation, and the batch hands off as two columns
+        self._titles = [None] * batch_size
+        self._texts = [None] * batch_size
+        self._n_pages = 0
         self.batch_size = batch_size
+        # the output is a dataset directory of part files, rotated every
+        # _ROWS_PER_FILE rows; each part is written under a temporary name
+        # and renamed into place on close, so a crash mid-run never leaves a
+        # truncated part at a final path
         self.output_file = Path(output_file)  # ensure correct path handling
+        self._claim_output_dir()
+        self._part_index = 0
+        self._rows_in_file = 0
+        self._current_part = None
+        self._tmp_part = None
         self.section_patt = section_patt
 
         self.filter_out_patterns = filter_out_patterns if filter_out_patterns else []
+        # titles are checked as soon as the <title> tag closes, so the text
+        # of a filtered page is never buffered, joined or cleaned
+        self._filter_re = re.compile("|".join(self.filter_out_patterns), flags=re.IGNORECASE) if self.filter_out_patterns else None
+        self._skip_page = False
         self.redirect_keywords = [kw.lower() for kw in (redirect_keywords if redirect_keywords else [])]
 
         self.parquet_writer = None
+        # transformed tables waiting to be written as one full row group
+        self._pending = []
+        self._pending_rows = 0
+
+        # text cleaning (regex passes + brace scanning, pure CPU) fans out over a
+        # process pool; the pool is created lazily on the first batch so tiny
+        # dumps never pay the spawn cost
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._executor = None
+
+        # batches are handed to a worker thread that filters, cleans and
+        # writes them while the SAX thread keeps parsing; the small maxsize
+        # bounds memory if parsing outruns the transform
+        self._work_queue = Queue(maxsize=2)
+        self._worker = None
+        self._worker_error = None
 
     def characters(self, content):
         """Accumulates characters within an XML tag."""
         if self._current_tag:
-            self._buffer.append(content)
+            self._buffer_write(content)
 
     def startElement(self, name, attrs):
         """Detects the start of relevant XML elements (title, text)."""
-        if name in ('title', 'text'):
-            self._current_tag = name
-            self._buffer = []
+        tag = _TAGS.get(name)
+        if tag is not None:
+            if self._skip_page and tag == _T_TEXT:
+                return  # page already rejected by its title
+            self._current_tag = tag
+            self._buffer.seek(0)
+            self._buffer.truncate()
 
     def endElement(self, name):
         """Processes elements at the end of an XML tag and stores relevant data."""
-        if self._current_tag:
-            content = ''.join(self._buffer)
-            if self._current_tag == 'title':
-                self._pages.append({'title': content, 'text': ''})
-            elif self._current_tag == 'text' and self._pages:
-                self._pages[-1]['text'] = content
+        tag = self._current_tag
+        if tag is not None:
+            content = self._buffer.getvalue()
+            if tag == _T_TITLE:
+                if self._filter_re is not None and self._filter_re.search(content):
+                    self._skip_page = True
+                else:
+                    self._titles[self._n_pages] = content
+                    self._texts[self._n_pages] = ''
+                    self._n_pages += 1
+            elif self._n_pages:  # _T_TEXT
+                self._texts[self._n_pages - 1] = content
             self._current_tag = None
 
         if name == 'page':
-            if len(self._pages) >= self.batch_size:
+            self._skip_page = False
+            if self._n_pages >= self.batch_size:
                 self.process_batch()
 
     def process_batch(self):
         """
-        Processes a batch of Wikipedia pages, filtering out non-content pages,
-        extracting the main text, and saving the results in Parquet format.
+        Hands the accumulated batch of pages to the worker thread, which
+        filters out non-content pages, extracts the main text, and saves the
+        results in Parquet format while parsing continues.
         """
-        if not self._pages:
+        if self._worker_error is not None:
+            raise self._worker_error
+
+        if not self._n_pages:
             return
 
-        df = pd.DataFrame(self._pages)
-        df = filter_non_content_pages(df, self.filter_out_patterns, self.redirect_keywords)
-        df['text'] = df['text'].apply(lambda x: extract_wiki_main_text(x, self.section_patt))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._drain_batches, daemon=True)
+            self._worker.start()
+
+        if self._n_pages == self.batch_size:
+            batch = (self._titles, self._texts)
+        else:
+            batch = (self._titles[:self._n_pages], self._texts[:self._n_pages])
+        self._work_queue.put(batch)
+        self._titles = [None] * self.batch_size
+        self._texts = [None] * self.batch_size
+        self._n_pages = 0
+
+    def _drain_batches(self):
+        """Worker loop: transforms and writes queued batches until the sentinel."""
+        while True:
+            batch = self._work_queue.get()
+            if batch is None:
+                return
+            if self._worker_error is not None:
+                continue  # keep draining so the producer never blocks
+            try:
+                self._write_batch(*batch)
+            except Exception as exc:  # surfaced on the SAX thread
+                self._worker_error = exc
 
-        if not df.empty:
-            table = pa.Table.from_pandas(df, preserve_index=False)
-            # table = pa.Table.from_pandas(df)
-            if self.parquet_writer is None:
-                self.parquet_writer = pq.ParquetWriter(str(self.output_file), table.schema, compression="gzip")
-            self.parquet_writer.write_table(table)
+    def _write_batch(self, titles_list, texts_list):
+        """Cleans and appends one batch of pages to the Parquet file.
 
-        self._pages.clear()
-        gc.collect()
+        Non-content pages were already rejected at the title tag, so the
+        batch arrives filtered.
+        """
+        titles = pa.array(titles_list, type=pa.string())
+        texts = texts_list
+
+        if len(titles):
+            # redirect pages are kept (the graph builder reads their target
+            # out of the raw text) but skip the cleaning pass, which is
+            # wasted work on a one-line '#REDIRECT [[...]]' body
+            if self.redirect_keywords:
+                prefixes = tuple(self.redirect_keywords)
+                redirect_mask = [text[:32].lstrip().lower().startswith(prefixes) for text in texts]
+            else:
+                redirect_mask = None
+
+            if redirect_mask is not None and any(redirect_mask):
+                cleaned = iter(self._clean_texts([text for text, is_redirect in zip(texts, redirect_mask) if not is_redirect]))
+                texts = [text if is_redirect else next(cleaned) for text, is_redirect in zip(texts, redirect_mask)]
+            else:
+                texts = self._clean_texts(texts)
+            table = pa.table(
+                {"title": titles, "text": pa.array(texts, type=pa.large_string())},
+                schema=_BATCH_SCHEMA,
+            )
+            self._pending.append(table)
+            self._pending_rows += len(table)
+            if self._pending_rows >= _TARGET_RG_ROWS:
+                self._flush_pending()
+
+    def _clean_texts(self, texts):
+        """Runs extract_wiki_main_text over the given texts, fanning out to
+        the process pool when more than one worker is configured."""
+        if not texts:
+            return []
+        if self.max_workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_clean_worker,
+                    initargs=(self.section_patt.pattern,),
+                )
+            return list(self._executor.map(_clean_text_worker, texts, chunksize=256))
+        section_patt = self.section_patt
+        return [extract_wiki_main_text(text, section_patt) for text in texts]
+
+    def _claim_output_dir(self):
+        """Prepares the dataset directory, clearing leftovers of earlier runs.
+
+        Runs eagerly at construction time — not on first flush — so a rerun
+        whose pages are all filtered out still removes the previous dump's
+        parts instead of leaving them for downstream readers to mix in.
+        """
+        if self.output_file.is_file():
+            self.output_file.unlink()  # single-file layout from an old run
+        self.output_file.mkdir(parents=True, exist_ok=True)
+        for stale in self.output_file.glob("part-*.parquet"):
+            stale.unlink()
+        for stale in self.output_file.glob("*.parquet.tmp"):
+            stale.unlink()
+
+    def _flush_pending(self):
+        """Writes the accumulated tables as one full-size row group."""
+        if not self._pending:
+            return
+        combined = pa.concat_tables(self._pending)
+        self._pending = []
+        self._pending_rows = 0
+        if self.parquet_writer is None:
+            self._current_part = self.output_file / f"part-{self._part_index:05d}.parquet"
+            self._tmp_part = self._current_part.with_suffix(".parquet.tmp")
+            # zstd-3 compresses wiki text several times faster than gzip
+            # for a comparable ratio; dictionary encoding collapses the
+            # repeated namespace prefixes in titles
+            self.parquet_writer = pq.ParquetWriter(
+                str(self._tmp_part),
+                _BATCH_SCHEMA,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=["title"],
+                data_page_size=2 << 20,
+                write_statistics=False,
+            )
+        self.parquet_writer.write_table(combined, row_group_size=_TARGET_RG_ROWS)
+        self._rows_in_file += len(combined)
+        if self._rows_in_file >= _ROWS_PER_FILE:
+            self._close_current_part()
+
+    def _close_current_part(self):
+        """Finalizes the open part file and arms the writer for the next one."""
+        if self.parquet_writer is None:
+            return
+        self.parquet_writer.close()
+        self.parquet_writer = None
+        self._tmp_part.replace(self._current_part)
+        self._part_index += 1
+        self._rows_in_file = 0
 
     def close_writer(self):
-        """Closes the Parquet writer to ensure data integrity."""
-        if self.parquet_writer:
-            self.parquet_writer.close()
-
-
-def load_language_settings(yaml_file="LANG_SETTINGS.yml"):
-    """
-    Loads language-specific settings from a YAML file.
-
-    Args:
-        yaml_file (str | Path): Path to the YAML file containing language settings.
-
-    Returns:
-        dict: A dictionary with language-specific settings, including regex patterns.
-    """
-    yaml_file = Path(yaml_file)
-    with yaml_file.open("r", encoding="utf-8") as f:
-        language_settings = yaml.safe_load(f)
-    for lang, settings in language_settings.items():
-        settings["section_patt"] = re.compile(settings["section_patt"], flags=re.IGNORECASE)
-    return language_settings
-
-
-def get_language_settings(language_code, yaml_file="LANG_SETTINGS.yml"):
-    """
-    Retrieves settings for a specific language from the YAML configuration.
-
-    Args:
-        language_code (str): The language code (e.g., "en", "es", "el", "pl").
-        yaml_file (str | Path): Path to the YAML file containing language settings.
-
-    Returns:
-        dict: A dictionary containing the language-specific settings.
-    """
-    language_settings = load_language_settings(yaml_file)
-    return language_settings.get(language_code, language_settings["en"])
+        """Flushes outstanding batches and closes the Parquet writer."""
+        if self._worker is not None:
+            self._work_queue.put(None)
+            self._worker.join()
+            self._worker = None
+        if self._worker_error is not None:
+            raise self._worker_error
+        self._flush_pending()  # worker has joined; safe from this thread
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._close_current_part()
 
 
 def _find_next_bz2_header(data, raw_file, read_size):
@@ -156,7 +338,7 @@ def _find_next_bz2_header(data, raw_file, read_size):
             return b''
 
 
-def _iter_multistream_bz2(filepath, read_size=65536):
+def _iter_multistream_bz2(filepath, read_size=1 << 20):
     """
     Decompress a multistream bz2 file, yielding chunks of raw bytes.
 
@@ -204,6 +386,51 @@ def _iter_multistream_bz2(filepath, read_size=65536):
                     return
 
 
+def _iter_parallel_bz2(filepath, executable, read_size=1 << 20):
+    """
+    Yield decompressed chunks from an external parallel bzip2 tool
+    (``lbzip2``/``pbzip2``), which decodes the independent streams of a
+    multistream dump across all cores.
+    """
+    proc = subprocess.Popen([executable, "-dc", str(filepath)], stdout=subprocess.PIPE)
+    exhausted = False
+    try:
+        with proc.stdout:
+            while True:
+                chunk = proc.stdout.read(read_size)
+                if not chunk:
+                    exhausted = True
+                    break
+                yield chunk
+    finally:
+        if proc.poll() is None:
+            proc.terminate()
+        proc.wait()
+        # an early generator close terminates the tool, so a nonzero exit
+        # is expected there; after natural EOF it means the tool died
+        # mid-stream and the output is silently truncated
+        if exhausted and proc.returncode != 0:
+            raise RuntimeError(
+                f"{executable} exited with status {proc.returncode} before "
+                f"finishing {filepath}; the decompressed dump is incomplete"
+            )
+
+
+def _iter_bz2_chunks(filepath):
+    """
+    Pick the fastest available decompressor for the dump.
+
+    Prefers ``lbzip2``/``pbzip2`` when installed (parallel, roughly N-core
+    scaling); otherwise falls back to the in-process decompressor, which is
+    serial but additionally recovers from corrupt streams.
+    """
+    for tool in ("lbzip2", "pbzip2"):
+        executable = shutil.which(tool)
+        if executable is not None:
+            return _iter_parallel_bz2(filepath, executable)
+    return _iter_multistream_bz2(filepath)
+
+
 def _feed_parser_from_chunks(chunk_iter, parser):
     """
     Feed decompressed byte chunks into a SAX parser with incremental UTF-8
@@ -217,7 +444,7 @@ def _feed_parser_from_chunks(chunk_iter, parser):
         parser.feed(tail)
 
 
-def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_graph_flag=False, use_string_labels=False):
+def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_graph_flag=False, use_string_labels=False, max_workers=None):
     """
     Parses a Wikipedia XML dump, extracts relevant content, and optionally generates a graph.
 
@@ -226,9 +453,14 @@ def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_gr
         language_code (str, optional): The language code for processing. Defaults to "en".
         base_dir (str | Path, optional): Base directory for storing output files. Defaults to None.
         generate_graph_flag (bool, optional): Whether to generate a graph after parsing. Defaults to False.
+        max_workers (int, optional): Worker processes for text cleaning. Defaults to the CPU count.
     """
     # print statement to show that the processing has started
     print(f"Processing the dump: {dump_filepath}.")
+    # the hot path builds no reference cycles, so the cyclic collector only
+    # adds stop-the-world pauses; raise the gen-0 threshold so it fires far
+    # less often while plain reference counting reclaims batches immediately
+    gc.set_threshold(100_000, 50, 10)
     settings = get_language_settings(language_code)
     section_patt = settings["section_patt"]
     filter_out_patterns = settings.get('filter_out_patterns', [])
@@ -242,11 +474,12 @@ def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_gr
     titles_texts_file = output_dir / f"{language_code}_WP_titles_texts.parquet"
 
     handler = WikiXmlHandler(
-        batch_size=10000,
+        batch_size=50000,
         output_file=titles_texts_file,
         section_patt=section_patt,
         filter_out_patterns=filter_out_patterns,
-        redirect_keywords=redirect_keywords
+        redirect_keywords=redirect_keywords,
+        max_workers=max_workers
     )
 
     # initialize XML parser
@@ -255,7 +488,7 @@ def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_gr
 
     # process the Wikipedia XML dump
     try:
-        _feed_parser_from_chunks(_iter_multistream_bz2(dump_filepath), parser)
+        _feed_parser_from_chunks(_iter_bz2_chunks(dump_filepath), parser)
     except xml.sax.SAXException:
         pass
     finally:
@@ -266,6 +499,9 @@ def parse_wikidump(dump_filepath, language_code="en", base_dir=None, generate_gr
 
     # generate graph if the flag is set
     if generate_graph_flag:
+        # imported here so parse-only runs skip the graph stack
+        from graph import generate_graph
+
         print("Creating the graph...")
         graph_output_dir = base_dir / language_code / "graph"
         graph_output_dir.mkdir(parents=True, exist_ok=True)
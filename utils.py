@@ -1,5 +1,5 @@
+import functools
 import re
-import wikitextparser as wtp
 import pandas as pd
 from typing import Pattern, List
 
@@ -11,48 +11,95 @@ refs_patt = re.compile(r'<\s*ref\b[^>]*\/\s*>|<\s*ref\b[^>]*>.*?<\s*\/\s*ref\s*>
 comments_patt = re.compile(r'< !--[\s\S]*?-- >|<!--[\s\S]*?-->', flags=re.DOTALL)
 
 
-# regex to find the beginning of the main text (e.g., bolded text)
-beginning_of_main_text_patt = re.compile(r"'''(.*?)'''")
+# regex to find the first section heading, which splits intro from body
+first_section_patt = re.compile(r'^==', flags=re.MULTILINE)
 
+# fused tail cleanup: stray '& nbsp;' entities and doubled spaces after
+# punctuation, handled in one scan instead of three chained str.replace
+# passes (each of which copies the whole article)
+tail_cleanup_patt = re.compile(r'& nbsp;|(?<=[.,])  ')
 
-def remove_templates(parsed: wtp.WikiText, cleaned_text: str) -> str:
-    """
-    Removes all template instances from the parsed wikitext string.
 
-    A template in Wikipedia syntax is typically enclosed in double curly braces,
-    e.g., `{{Infobox person}}`, `{{Citation needed}}`, etc. This function removes
-    such templates from the given `cleaned_text` by iterating over the parsed
-    `wtp.WikiText` object and removing any matching template content.
+def _tail_cleanup_repl(match: 're.Match') -> str:
+    # two-space matches collapse to one space; '& nbsp;' disappears
+    return '' if match.group(0) == '& nbsp;' else ' '
 
-    Args:
-        parsed (wtp.WikiText): A WikiTextParser-parsed object containing structured
-            information about the wikitext, including its templates.
-        cleaned_text (str): The original wikitext content in string form from which
-            templates are to be removed.
 
-    Returns:
-        str: The `cleaned_text` with all templates found in `parsed.templates` removed.
+# fused pattern for the non-nested markup: <ref> tags and HTML comments
+# found in one scan; template spans come from the brace scanner below
+refs_comments_patt = re.compile(
+    refs_patt.pattern + '|' + comments_patt.pattern, flags=re.DOTALL
+)
 
-    Example:
-        >>> import wikitextparser as wtp
-        >>> raw_text = "Barack Obama was the 44th president of the United States. {{Infobox person}}"
-        >>> parsed = wtp.parse(raw_text)
-        >>> result = remove_templates(parsed, raw_text)
-        >>> print(result)
-        'Barack Obama was the 44th president of the United States. '
-
-    Notes:
-        This function only removes exact string matches of the templates present in
-        `parsed.templates`. If the `cleaned_text` was modified before this step (e.g.,
-        whitespace normalized), template strings may not match exactly and remain.
-    """
-    for template in parsed.templates:
-        cleaned_text = cleaned_text.replace(str(template), '')
-    return cleaned_text
 
+def _template_spans(text: str) -> list:
+    """Finds the top-level ``{{...}}`` template spans, respecting nesting.
 
-
-def extract_wiki_main_text(wiki_text: str, section_patt: Pattern) -> str:
+    A hand-rolled brace-depth walk over ``str.find`` calls: each probe is a
+    C-level substring search, so the whole scan costs far less than running
+    a recursive regex over the same text. Unbalanced openings (no matching
+    ``}}`` before end of text) are left in place, matching how a balanced
+    pattern would simply fail to match them.
+    """
+    spans = []
+    find = text.find
+    i = 0
+    while True:
+        start = find('{{', i)
+        if start == -1:
+            return spans
+        depth = 1
+        j = start + 2
+        while depth:
+            closer = find('}}', j)
+            if closer == -1:
+                j = -1
+                break
+            opener = find('{{', j)
+            if opener != -1 and opener < closer:
+                depth += 1
+                j = opener + 2
+            else:
+                depth -= 1
+                j = closer + 2
+        if j == -1:
+            # unbalanced: skip this opening, keep scanning for inner spans
+            i = start + 2
+        else:
+            spans.append((start, j))
+            i = j
+
+
+def _strip_markup(text: str) -> str:
+    """Removes templates, <ref> tags and HTML comments in one splice.
+
+    Collects the removal spans — templates from the brace scanner, refs and
+    comments from one fused regex pass — merges overlaps, and rebuilds the
+    surviving slices with a single ``''.join``, so the text is copied once
+    no matter how much markup it carries.
+    """
+    spans = _template_spans(text)
+    spans.extend(m.span() for m in refs_comments_patt.finditer(text))
+    if not spans:
+        return text
+    spans.sort()
+    parts = []
+    prev_end = 0
+    for start, end in spans:
+        if start >= prev_end:
+            parts.append(text[prev_end:start])
+            prev_end = end
+        elif end > prev_end:
+            # overlapping span (e.g. a ref inside a template): extend the cut
+            prev_end = end
+    parts.append(text[prev_end:])
+    return ''.join(parts)
+
+
+def extract_wiki_main_text(wiki_text: str, section_patt: Pattern,
+                           _strip=_strip_markup,
+                           _first_section=first_section_patt.search,
+                           _tail=tail_cleanup_patt.sub) -> str:
     """
     Cleans and extracts the main body text from raw Wikipedia markup.
 
@@ -82,7 +129,6 @@ def extract_wiki_main_text(wiki_text: str, section_patt: Pattern) -> str:
 
     Example:
         >>> import re
-        >>> import wikitextparser as wtp
         >>> from my_module import extract_wiki_main_text
         >>> wiki_markup = '''
         {{Infobox person}}
@@ -102,17 +148,16 @@ def extract_wiki_main_text(wiki_text: str, section_patt: Pattern) -> str:
         - The 30% threshold for bold-text trimming is a heuristic. Articles whose first
           bold phrase appears later than that (e.g., long preambles without a bolded
           subject) will have their intro preserved in full.
-        - Assumes the `remove_templates` function is available and that the following
-          global regex patterns exist in scope:
-            - `refs_patt`: pattern for <ref> tags
-            - `comments_patt`: pattern for HTML comments
-            - `beginning_of_main_text_patt`: pattern to find the main bolded subject line.
-        - The regex patterns must be compiled prior to calling this function.
+        - Template spans are located by `_template_spans` (a brace-depth
+          scanner), while `refs_patt`/`comments_patt` handle the non-nested
+          markup; the bolded subject line is found with a literal search.
     """
     # Step 1: Split article into intro (before first ==) and rest
     # This avoids detecting orphaned bold text from removed templates
-    first_section_match = re.search(r'^==', wiki_text, flags=re.MULTILINE)
-    
+    # (the pattern methods are bound as default args: this function runs
+    # once per article, so each global/attribute lookup saved counts)
+    first_section_match = _first_section(wiki_text)
+
     if first_section_match:
         intro_text = wiki_text[:first_section_match.start()]
         rest_text = wiki_text[first_section_match.start():]
@@ -121,27 +166,28 @@ def extract_wiki_main_text(wiki_text: str, section_patt: Pattern) -> str:
         intro_text = wiki_text
         rest_text = ""
     
-    # Step 2: Clean the intro section
-    parsed = wtp.parse(intro_text)
-    cleaned_intro = intro_text
-    
-    # Remove templates (before other operations to avoid creating orphaned bold text)
-    cleaned_intro = remove_templates(parsed, cleaned_intro)
-    
-    # Remove <ref> tags
-    cleaned_intro = re.sub(refs_patt, '', cleaned_intro)
-    
-    # Remove HTML comments
-    cleaned_intro = re.sub(comments_patt, '', cleaned_intro)
+    # Step 2: Clean the intro section - remove templates, <ref> tags and
+    # HTML comments in one splice (template spans from the brace scanner,
+    # the rest from a single fused regex pass)
+    cleaned_intro = _strip(intro_text)
     
     # Step 3: Use bold-text detection only if intro has leading junk
-    # (e.g., leftover metadata)
-    beginning_of_main_text = beginning_of_main_text_patt.search(cleaned_intro)
-    if beginning_of_main_text:
+    # (e.g., leftover metadata). The bolded subject is a literal ''' pair
+    # on one line, so locate it with str.find's C substring search rather
+    # than a regex pass
+    idx = cleaned_intro.find("'''")
+    while idx != -1:
+        closing = cleaned_intro.find("'''", idx + 3)
+        if closing == -1:
+            idx = -1
+            break
+        if cleaned_intro.find('\n', idx + 3, closing) == -1:
+            break  # opening and closing ''' sit on the same line
+        idx = cleaned_intro.find("'''", idx + 1)
+    if idx != -1:
         # Only trim if the match is reasonably early (not the bulk of content)
-        match_start = beginning_of_main_text.start()
-        if match_start < len(cleaned_intro) * 0.3:  # Less than 30% into the text
-            cleaned_intro = cleaned_intro[match_start:]
+        if idx < len(cleaned_intro) * 0.3:  # Less than 30% into the text
+            cleaned_intro = cleaned_intro[idx:]
     
     # Step 4: Check if we need to cut off trailing non-main sections
     combined_text = cleaned_intro + rest_text
@@ -150,11 +196,43 @@ def extract_wiki_main_text(wiki_text: str, section_patt: Pattern) -> str:
         end_index = end_main_text.start()
         combined_text = combined_text[:end_index]
     
-    combined_text = combined_text.replace('& nbsp;', '').replace('.  ', '. ').replace(',  ', ', ')
+    combined_text = _tail(_tail_cleanup_repl, combined_text)
     
     return combined_text.strip()
 
 
+# characters that make a filter pattern more than a literal prefix
+_REGEX_META_PATT = re.compile(r'[.\[\]{}()*+?|$\\]')
+
+
+@functools.lru_cache(maxsize=None)
+def _split_filter(patterns: tuple):
+    """Splits (and caches) title filter patterns into a fast and a slow path.
+
+    Most configured patterns are plain namespace prefixes ("^Wikipedia:",
+    "^User:", ...), which a tuple-argument str.startswith handles without
+    the regex engine. Anything else — escaped literals like
+    "\\(disambiguation\\)" or bare substrings — stays in a compiled union
+    run only over that residue.
+
+    Returns:
+        tuple: `(prefixes, residual_patt)` where `prefixes` is a tuple of
+        lowercased literal prefixes and `residual_patt` is a compiled
+        lowercased pattern or None.
+    """
+    prefixes, residual = [], []
+    for pattern in patterns:
+        if pattern.startswith('^') and not _REGEX_META_PATT.search(pattern[1:]):
+            prefixes.append(pattern[1:].lower())
+        else:
+            residual.append(pattern)
+    residual_patt = (
+        re.compile("|".join(pattern.lower() for pattern in residual))
+        if residual else None
+    )
+    return tuple(prefixes), residual_patt
+
+
 def filter_non_content_pages(df: pd.DataFrame, filter_out_patterns: List[str], redirect_keywords: List[str]) -> pd.DataFrame:
     """
     Filters out non-content Wikipedia pages from a DataFrame based on title patterns 
@@ -202,8 +280,31 @@ def filter_non_content_pages(df: pd.DataFrame, filter_out_patterns: List[str], r
         redirect_keywords = []
 
     # remove pages whose titles match any of the filter-out patterns (e.g., "^user:", "^talk:", etc.)
+    # the patterns and the title column are lowercased once so every
+    # comparison runs case-sensitively; literal namespace prefixes are
+    # checked with str.startswith and only the residue touches the regex engine
     if filter_out_patterns:
-        df = df[~df['title'].str.contains("|".join(filter_out_patterns), flags=re.IGNORECASE, na=False)]
+        prefixes, residual_patt = _split_filter(tuple(filter_out_patterns))
+        # titles repeat heavily after joins/explodes, so test each unique
+        # title once and gather the verdicts back through the factorize
+        # codes; on mostly-unique columns (a plain article dump) this falls
+        # back to matching the column directly
+        codes, uniques = pd.factorize(df['title'])
+        if len(uniques) < 0.9 * len(df):
+            lowered = pd.Series(uniques).str.lower()
+            index = lowered.index
+        else:
+            codes = None
+            lowered = df['title'].str.lower()
+            index = df.index
+        mask = lowered.str.startswith(prefixes) if prefixes else pd.Series(False, index=index)
+        if residual_patt is not None:
+            mask |= lowered.str.contains(residual_patt, na=False)
+        mask = mask.fillna(False)
+        if codes is not None:
+            # codes of -1 mark missing titles, which never match (na=False)
+            mask = pd.Series(mask.to_numpy()[codes] & (codes >= 0), index=df.index)
+        df = df[~mask]
 
     return df
 
@@ -292,6 +393,34 @@ def fix_dubious_links(link: str) -> str:
     return link.replace('_', ' ')
 
 
+def fix_dubious_links_series(links: pd.Series) -> pd.Series:
+    """
+    Vectorized counterpart of `fix_dubious_links` for a whole Series.
+
+    Replaces underscores with spaces in one C-level pass over the column
+    instead of dispatching a Python call per row. Non-string and missing
+    entries pass through unchanged, matching the scalar function.
+
+    Args:
+        links (pd.Series): A Series of Wikipedia link strings (may contain
+            NaN or non-string values).
+
+    Returns:
+        pd.Series: The Series with underscores replaced by spaces in every
+        string entry.
+
+    Example:
+        >>> import pandas as pd
+        >>> fix_dubious_links_series(pd.Series(["Barack_Obama", None]))
+        0    Barack Obama
+        1            None
+        dtype: object
+    """
+    # .str.replace yields NaN for non-string entries; restore those (and
+    # genuine NaNs) from the original series
+    return links.str.replace('_', ' ', regex=False).fillna(links)
+
+
 def resolve_redirects(target_series: pd.Series, reverse_redirect_dict: dict) -> pd.Series:
     """
     Resolves redirects in a pandas Series of Wikipedia article titles using a 
@@ -330,4 +459,17 @@ def resolve_redirects(target_series: pd.Series, reverse_redirect_dict: dict) ->
         - Titles not present in the redirect dictionary remain unchanged.
         - Assumes exact case-sensitive matches for redirect keys.
     """
-    return target_series.apply(lambda target: reverse_redirect_dict.get(target, target))
\ No newline at end of file
+    # wikilinks are extremely repetitive (unique titles << rows), so
+    # factorize once and probe the dict per unique title instead of per
+    # row, then gather the resolved titles back through the integer codes
+    codes, uniques = pd.factorize(target_series)
+    lut = pd.Series(uniques, dtype=object)
+    lut = lut.map(reverse_redirect_dict).fillna(lut)
+    resolved = pd.Series(
+        lut.to_numpy()[codes], index=target_series.index, name=target_series.name
+    )
+    if (codes < 0).any():
+        # factorize codes missing values as -1; restore them untouched
+        # rather than letting -1 wrap to the last lookup-table entry
+        resolved[codes < 0] = target_series[codes < 0]
+    return resolved
\ No newline at end of file
@@ -1,9 +1,7 @@
 import argparse
 from pathlib import Path
-from gui import gui_prompt_for_inputs
 from config import get_language_settings
 from parser_module import parse_wikidump
-from graph import generate_graph
 
 
 def parse_args():
@@ -50,9 +48,15 @@ def main():
     """
     args = parse_args()
 
-    # if required arguments are missing, prompt user via GUI
+    # if required arguments are missing, prompt user via GUI; imported here
+    # so CLI-only runs never pay the tkinter/Tcl start-up cost
     if not args.dump_filepath or not args.language_code:
+        from gui import gui_prompt_for_inputs
         dump_filepath, language_code, base_dir, generate_graph_flag = gui_prompt_for_inputs()
+        if dump_filepath is None:
+            # user closed the window without confirming
+            print("No inputs provided; exiting.")
+            return
     else:
         dump_filepath = Path(args.dump_filepath)  # convert to Path object
         language_code = args.language_code